@@ -6,101 +6,274 @@
 接口列表：
 - POST /api/resolve      解析视频，返回下载地址、标题、作者
 - POST /api/transcript   解析视频 + 语音转文字 + AI润色，返回完整文案
-- POST /api/save_feishu  解析视频 + 转写 + AI润色 + 保存到飞书
+- POST /api/transcript/stream  同上，以 SSE 事件流逐阶段返回
+- POST /api/resolve_batch     批量解析（最多 50 个链接）
+- POST /api/transcript_batch  批量获取文案（最多 50 个链接）
+- POST /api/save_feishu  解析视频 + 转写 + AI润色 + 保存到飞书（异步，返回 job_id）
+- GET  /api/jobs/<job_id> 查询异步任务状态
 - POST /api/email        解析视频 + 转写 + AI润色 + 发送邮件
 - GET  /api/download     代理下载视频（绕过防盗链）
+- GET  /api/proxy/<token> 签名代理地址，仅供火山引擎转写时拉取视频
 
-启动: gunicorn -w 2 -b 0.0.0.0:3102 --timeout 180 app:app
+启动: gunicorn -k gthread -w 1 --threads 64 -b 0.0.0.0:3102 --timeout 180 --backlog 2048 --keep-alive 30 app:app
+
+所有接口都是 I/O 密集型（抖音、火山引擎、方舟、飞书、SMTP），使用 gthread 线程 worker，
+单个请求只占用一个线程，单进程即可同时处理数十个转写/下载请求。
+异步任务状态默认保存在进程内存中，必须单进程运行；配置 REDIS_URL 后才能使用多个 worker（如 -w 2 --threads 32）。
 """
 
+import functools
 import logging
 import os
+import re
+import socket
+import string
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from email.utils import parseaddr
+from typing import Union
+from urllib.parse import quote, urlsplit
 
+import orjson
 import requests as http_requests
-from flask import Flask, jsonify, request, Response
-
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+from flask import Flask, g, jsonify, request, Response
+from flask.json.provider import JSONProvider
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from cache import StageCache, hash_key, hit_rate
 from config import Config
+from jobs import JobStore
 from video_resolver import VideoResolver, extract_url_from_text, resolve_short_url, extract_aweme_id
-from models import VideoRecord
+from models import TranscriptResponse, VideoRecord
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(JSONProvider):
+    """基于 orjson 的 JSON 序列化
+
+    文案接口返回的中文长文本较多，orjson 编码更快，且直接输出 UTF-8 不做 \\uXXXX 转义，
+    响应体积约减半。jsonify 和 request.get_json 都会走这里。
+    """
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 resolver = VideoResolver(timeout=15.0)
 
+# 文件名清理：只保留中文、英文、数字、下划线和连字符
+_FILENAME_RE = re.compile(r'[^\w\u4e00-\u9fff\-]')
+# 纯 ASCII 标题的快速路径：非 [A-Za-z0-9_-] 的字符一次 translate 替换为下划线
+_SAFE_ASCII = set(string.ascii_letters + string.digits + "_-")
+_SAFE_TRANS = str.maketrans({chr(c): "_" for c in range(128) if chr(c) not in _SAFE_ASCII})
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """连接池适配器：开启 TCP_NODELAY + SO_KEEPALIVE，长期复用到 CDN 的 TLS 连接"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        # urllib3 默认选项已包含 TCP_NODELAY，这里再追加 SO_KEEPALIVE
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+# 代理下载共用的 CDN Session，避免每次下载都重新 TCP + TLS 握手
+cdn_session = http_requests.Session()
+_cdn_adapter = _KeepAliveAdapter(
+    pool_connections=64,
+    pool_maxsize=256,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False),
+)
+cdn_session.mount("https://", _cdn_adapter)
+cdn_session.mount("http://", _cdn_adapter)
+
+# 转写代理地址签名：只有本服务签发的播放地址才能通过 /api/proxy 拉取
+# 未配置 PROXY_SECRET 时不签发也不接受任何代理地址，转写功能随之关闭
+_proxy_signer = URLSafeTimedSerializer(Config.PROXY_SECRET, salt="video-proxy") if Config.PROXY_SECRET else None
+if Config.VOLC_APP_ID and Config.VOLC_ACCESS_TOKEN and not Config.PROXY_SECRET:
+    logger.error("未配置 PROXY_SECRET，转写代理与转写功能已禁用")
+
+# 后台线程池：AI 标题生成与纠错/摘要并行，只承载标题生成这一个短任务
+_executor = ThreadPoolExecutor(max_workers=8)
+
+# SSE 接口线程池：各阶段在这里执行，请求线程一边等待一边发送心跳
+_stream_executor = ThreadPoolExecutor(max_workers=32)
+# SSE 心跳间隔（秒），需小于 nginx 默认 proxy_read_timeout（60s）
+SSE_KEEPALIVE_INTERVAL = 15
+
+# 批量接口线程池：解析较轻量，并发 16；转写受火山引擎配额限制，最多同时 5 个
+_resolve_batch_executor = ThreadPoolExecutor(max_workers=16)
+_transcript_batch_executor = ThreadPoolExecutor(max_workers=5)
+BATCH_MAX_SIZE = 50
+
+# 异步任务：保存飞书等耗时流程在后台执行，调用方轮询 /api/jobs/<job_id>
+_job_executor = ThreadPoolExecutor(max_workers=4)
+_jobs = JobStore(redis_url=Config.REDIS_URL)
+
+# 这些原始标题视为无效，需要 AI 生成新标题
+_WEAK_TITLES = frozenset({"未知", "未知视频", "抖音"})
+# 文字稿开头的书名号/引号标题，如「《标题》正文...」
+_HEADING_RE = re.compile(r'^\s*[《「『“"]([^》」』”"\n]{4,18})[》」』”"]')
+
+# 各阶段结果缓存：同一视频重复提交（如多维表格重复触发）时直接返回
+_resolve_cache = StageCache("resolve")
+_transcript_cache = StageCache("transcript")
+_ai_cache = StageCache("ai")
+
 # --- 懒加载组件 ---
+# 多线程 worker 下可能有多个请求同时首次访问，用双重检查锁保证每个组件只构造一次
+
+_init_lock = threading.Lock()
 
 _transcriber = None
 def get_transcriber():
     global _transcriber
     if _transcriber is None and Config.is_transcribe_enabled():
-        from transcriber import Transcriber
-        _transcriber = Transcriber(app_id=Config.VOLC_APP_ID, access_token=Config.VOLC_ACCESS_TOKEN)
+        with _init_lock:
+            if _transcriber is None:
+                from transcriber import Transcriber
+                _transcriber = Transcriber(app_id=Config.VOLC_APP_ID, access_token=Config.VOLC_ACCESS_TOKEN)
     return _transcriber
 
 _ai = None
 def get_ai():
     global _ai
     if _ai is None and Config.is_ai_enabled():
-        from ai_processor import AIProcessor
-        _ai = AIProcessor(api_key=Config.ARK_API_KEY, model=Config.ARK_MODEL)
+        with _init_lock:
+            if _ai is None:
+                from ai_processor import AIProcessor
+                _ai = AIProcessor(api_key=Config.ARK_API_KEY, model=Config.ARK_MODEL)
     return _ai
 
 _feishu = None
 def get_feishu():
     global _feishu
     if _feishu is None and Config.is_feishu_enabled():
-        from feishu_client import FeishuClient
-        _feishu = FeishuClient(app_id=Config.FEISHU_APP_ID, app_secret=Config.FEISHU_APP_SECRET, folder_token=Config.FEISHU_FOLDER_TOKEN)
+        with _init_lock:
+            if _feishu is None:
+                from feishu_client import FeishuClient
+                _feishu = FeishuClient(app_id=Config.FEISHU_APP_ID, app_secret=Config.FEISHU_APP_SECRET, folder_token=Config.FEISHU_FOLDER_TOKEN)
     return _feishu
 
 _email = None
 def get_email():
     global _email
     if _email is None and Config.is_email_enabled():
-        from email_sender import EmailSender
-        _email = EmailSender(host=Config.SMTP_HOST, port=Config.SMTP_PORT, user=Config.SMTP_USER, password=Config.SMTP_PASS)
+        with _init_lock:
+            if _email is None:
+                from email_sender import EmailSender
+                _email = EmailSender(host=Config.SMTP_HOST, port=Config.SMTP_PORT, user=Config.SMTP_USER, password=Config.SMTP_PASS)
     return _email
 
 
+def _prewarm():
+    """启动时预先构造已配置的组件，避免首个请求承担导入和初始化开销"""
+    for getter in (get_transcriber, get_ai, get_feishu, get_email):
+        getter()
+
+
+_prewarm()
+
+
 # --- 工具函数 ---
 
+def _succeeded(result: dict) -> bool:
+    """阶段结果是否成功（只缓存成功的结果）"""
+    return bool(result.get("success"))
+
+
+def _resolve_cache_key(url: str) -> str:
+    """解析结果的缓存键：能直接拿到 aweme_id 就用 aweme_id，否则（短链接）用链接本身"""
+    link = extract_url_from_text(url) or url.strip()
+    return extract_aweme_id(link) or link
+
+
 def _resolve_video(url: str) -> dict:
     """解析视频，返回结果字典"""
-    video = VideoRecord(title="", url=url)
-    result = resolver.resolve(video)
-    if not result.video_play_url:
-        return {"success": False, "error": "解析失败，请检查链接是否有效"}
-    return {
-        "success": True,
-        "title": result.title or "",
-        "author": result.author or "",
-        "aweme_id": result.aweme_id,
-        "play_url": result.video_play_url,
-        "duration": round(result.duration_seconds, 1),
-    }
+
+    def compute() -> dict:
+        video = VideoRecord(title="", url=url)
+        result = resolver.resolve(video)
+        if not result.video_play_url:
+            return {"success": False, "error": "解析失败，请检查链接是否有效"}
+        resolved = {
+            "success": True,
+            "title": result.title or "",
+            "author": result.author or "",
+            "aweme_id": result.aweme_id,
+            "play_url": result.video_play_url,
+            "duration": round(result.duration_seconds, 1),
+        }
+        if result.aweme_id and result.aweme_id != key:
+            # 短链接解析后再按 aweme_id 存一份，长链接提交同一视频时也能命中
+            _resolve_cache.set(result.aweme_id, resolved)
+        return resolved
+
+    key = _resolve_cache_key(url)
+    return dict(_resolve_cache.get_or_compute(key, compute, cacheable=_succeeded))
+
+
+def _signed_proxy_url(play_url: str) -> str:
+    """为播放地址签发一个限时的代理地址"""
+    token = _proxy_signer.dumps(play_url)
+    return f"{Config.PUBLIC_BASE_URL}/api/proxy/{token}"
 
 
 def _transcribe_video(play_url: str) -> dict:
     """转写视频语音
-    
-    将播放地址转换为本地代理地址，让火山引擎通过我们的服务器下载视频
+
+    将播放地址转换为签名代理地址，让火山引擎通过我们的服务器下载视频
     """
     transcriber = get_transcriber()
     if not transcriber:
         return {"success": False, "error": "转写功能未配置"}
-    
-    # 使用本地代理地址，绕过抖音防盗链
-    # 火山引擎会通过我们的服务器下载视频
-    proxy_url = f"http://127.0.0.1:3102/api/download?url={play_url}"
-    logger.info(f"使用代理地址进行转写: {proxy_url}")
-    
-    result = transcriber.transcribe(proxy_url)
-    if result.error:
-        return {"success": False, "error": result.error}
-    return {"success": True, "text": result.text, "duration": round(result.duration, 1)}
+
+    def compute() -> dict:
+        # 使用签名代理地址，绕过抖音防盗链
+        # 播放地址编码在 token 中，不再作为未转义的 query 参数拼接
+        proxy_url = _signed_proxy_url(play_url)
+        logger.info(f"使用代理地址进行转写: {proxy_url}")
+
+        result = transcriber.transcribe(proxy_url)
+        if result.error:
+            return {"success": False, "error": result.error}
+        return {"success": True, "text": result.text, "duration": round(result.duration, 1)}
+
+    key = hash_key(play_url)
+    return dict(_transcript_cache.get_or_compute(key, compute, cacheable=_succeeded))
+
+
+def _needs_title(title: str) -> bool:
+    """原标题缺失、过短或是占位文字时才需要生成标题；Config.AI_FORCE_TITLE 为 true 时总是生成"""
+    if Config.AI_FORCE_TITLE:
+        return True
+    title = title.strip()
+    return not title or title in _WEAK_TITLES or len(title) < 4
+
+
+def _title_from_text(text: str) -> str:
+    """文字稿开头已经是书名号/引号包裹的标题时直接取用，省去一次大模型调用"""
+    match = _HEADING_RE.match(text[:20])
+    return match.group(1).strip() if match else ""
 
 
 def _ai_process(text: str, title: str = "") -> dict:
@@ -108,34 +281,142 @@ def _ai_process(text: str, title: str = "") -> dict:
     ai = get_ai()
     if not ai:
         return {"corrected": text, "summary": "", "title": title or "未知视频"}
-    ai_result = ai.process(text)
-    corrected = ai_result.corrected_text if ai_result.success else text
-    summary = ai_result.summary if ai_result.success else ""
-    if not title or title == "未知":
-        generated = ai.generate_title(corrected)
-        if generated:
-            title = generated
-    return {"corrected": corrected, "summary": summary, "title": title or "未知视频"}
+
+    def compute() -> dict:
+        # 标题生成与纠错/摘要互不依赖：标题提交到线程池，纠错/摘要在当前线程执行
+        title_future = None
+        new_title = title
+        if _needs_title(title):
+            heading = "" if Config.AI_FORCE_TITLE else _title_from_text(text)
+            if heading:
+                new_title = heading
+            else:
+                title_future = _executor.submit(ai.generate_title, text)
+
+        ai_result = ai.process(text)
+        corrected = ai_result.corrected_text if ai_result.success else text
+        summary = ai_result.summary if ai_result.success else ""
+        if title_future is not None:
+            generated = title_future.result()
+            if generated:
+                new_title = generated
+        return {"success": ai_result.success, "corrected": corrected, "summary": summary, "title": new_title or "未知视频"}
+
+    key = hash_key(text, title)
+    return dict(_ai_cache.get_or_compute(key, compute, cacheable=_succeeded))
+
+
+def _build_transcript_response(resolve_result: dict, ai_result: dict) -> TranscriptResponse:
+    """由解析结果和 AI 结果组装 /api/transcript 响应"""
+    return TranscriptResponse(
+        title=ai_result["title"],
+        author=resolve_result.get("author", ""),
+        duration=resolve_result.get("duration", 0),
+        text=ai_result["corrected"],
+        summary=ai_result["summary"],
+        play_url=resolve_result["play_url"],
+    )
+
+
+def _transcript_pipeline(url: str) -> Union[TranscriptResponse, dict]:
+    """解析 + 转写 + AI 处理，成功返回 TranscriptResponse，失败返回错误字典"""
+    # 1. 解析视频
+    resolve_result = _resolve_video(url)
+    if not resolve_result.get("success"):
+        return resolve_result
+
+    # 2. 语音转文字
+    transcript = _transcribe_video(resolve_result["play_url"])
+    if not transcript.get("success"):
+        return {"success": False, "error": f"转写失败: {transcript.get('error')}"}
+
+    # 3. AI 处理
+    ai_result = _ai_process(transcript["text"], resolve_result.get("title", ""))
+
+    return _build_transcript_response(resolve_result, ai_result)
+
+
+def _run_batch(executor: ThreadPoolExecutor, fn, urls: list) -> list:
+    """用线程池并发处理一批链接，结果顺序与输入一致；单条失败不影响其他条目"""
+
+    def run_one(url):
+        if not isinstance(url, str) or not extract_url_from_text(url):
+            return {"success": False, "error": "未找到有效的抖音链接"}
+        try:
+            return fn(url.strip())
+        except Exception as e:
+            logger.error(f"批量处理失败: {url} - {e}")
+            return {"success": False, "error": str(e)}
+
+    return list(executor.map(run_one, urls))
+
+
+def _sse(event: str, data) -> str:
+    """构造一条 Server-Sent Events 消息（orjson 输出不含换行，可直接作为单行 data）"""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+
+def _sse_wait(future: Future):
+    """等待阶段结果，期间定时发送 SSE 注释心跳，防止长时间无数据被代理断开
+
+    用法: result = yield from _sse_wait(future)
+    """
+    while True:
+        try:
+            return future.result(timeout=SSE_KEEPALIVE_INTERVAL)
+        except FutureTimeoutError:
+            yield ": keepalive\n\n"
+
+
+# --- 请求校验 ---
+
+def require_douyin_url(view):
+    """校验请求体中的 url 参数：缺失或不含抖音链接时直接返回 400，不发起任何网络请求
+
+    校验通过后请求体存入 g.data，清理后的 url 存入 g.url，接口内直接使用，不再重复解析。
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+        url = data.get("url", "")
+        url = url.strip() if isinstance(url, str) else ""
+        if not url:
+            return jsonify({"success": False, "error": "请提供 url 参数"}), 400
+        if not extract_url_from_text(url):
+            return jsonify({"success": False, "error": "未找到有效的抖音链接"}), 400
+        g.data = data
+        g.url = url
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def _is_valid_email(addr: str) -> bool:
+    """粗略校验邮箱地址格式"""
+    _, parsed = parseaddr(addr)
+    local, _, domain = parsed.partition("@")
+    return bool(local and "." in domain)
 
 
 # --- API 接口 ---
 
 @app.route("/api/resolve", methods=["POST"])
+@require_douyin_url
 def api_resolve():
     """接口1: 解析视频下载地址
 
     请求: {"url": "抖音链接或分享文本"}
     响应: {"success": true, "title": "...", "author": "...", "play_url": "...", "duration": 12.3}
     """
-    data = request.get_json(silent=True) or {}
-    url = data.get("url", "").strip()
-    if not url:
-        return jsonify({"success": False, "error": "请提供 url 参数"}), 400
-    result = _resolve_video(url)
+    result = _resolve_video(g.url)
     return jsonify(result)
 
 
 @app.route("/api/transcript", methods=["POST"])
+@require_douyin_url
 def api_transcript():
     """接口2: 解析视频 + 语音转文字 + AI润色
 
@@ -150,60 +431,114 @@ def api_transcript():
         "play_url": "下载地址"
     }
     """
-    data = request.get_json(silent=True) or {}
-    url = data.get("url", "").strip()
-    if not url:
-        return jsonify({"success": False, "error": "请提供 url 参数"}), 400
+    return jsonify(_transcript_pipeline(g.url))
 
-    # 1. 解析视频
-    resolve_result = _resolve_video(url)
-    if not resolve_result.get("success"):
-        return jsonify(resolve_result)
 
-    # 2. 语音转文字
-    transcript = _transcribe_video(resolve_result["play_url"])
-    if not transcript.get("success"):
-        return jsonify({"success": False, "error": f"转写失败: {transcript.get('error')}"})
+@app.route("/api/transcript/stream", methods=["POST"])
+@require_douyin_url
+def api_transcript_stream():
+    """接口2(流式): 解析视频 + 语音转文字 + AI润色，以 SSE 事件流逐阶段返回
 
-    # 3. AI 处理
-    ai_result = _ai_process(transcript["text"], resolve_result.get("title", ""))
+    请求: {"url": "抖音链接或分享文本"}
+    响应: text/event-stream，依次推送事件：
+        resolve     解析结果（同 /api/resolve）
+        transcript  转写原文 {"text": "...", "duration": 12.3}
+        ai          AI 处理结果 {"title": "...", "text": "...", "summary": "..."}
+        done        最终结果（同 /api/transcript）
+        error       任一阶段失败时推送 {"success": false, "error": "..."}，随后结束
+    等待期间每 15 秒推送一条 ": keepalive" 注释；客户端断开后不再执行后续阶段。
+    """
+    url = g.url
+
+    def stages():
+        # 1. 解析视频
+        resolve_result = yield from _sse_wait(_stream_executor.submit(_resolve_video, url))
+        if not resolve_result.get("success"):
+            yield _sse("error", resolve_result)
+            return
+        yield _sse("resolve", resolve_result)
+
+        # 2. 语音转文字
+        transcript = yield from _sse_wait(_stream_executor.submit(_transcribe_video, resolve_result["play_url"]))
+        if not transcript.get("success"):
+            yield _sse("error", {"success": False, "error": f"转写失败: {transcript.get('error')}"})
+            return
+        yield _sse("transcript", {"text": transcript["text"], "duration": transcript["duration"]})
+
+        # 3. AI 处理
+        ai_result = yield from _sse_wait(
+            _stream_executor.submit(_ai_process, transcript["text"], resolve_result.get("title", ""))
+        )
+        yield _sse("ai", {"title": ai_result["title"], "text": ai_result["corrected"], "summary": ai_result["summary"]})
 
-    return jsonify({
-        "success": True,
-        "title": ai_result["title"],
-        "author": resolve_result.get("author", ""),
-        "duration": resolve_result.get("duration", 0),
-        "text": ai_result["corrected"],
-        "summary": ai_result["summary"],
-        "play_url": resolve_result["play_url"],
+        yield _sse("done", _build_transcript_response(resolve_result, ai_result))
+
+    def generate():
+        # 阶段内异常也以 error 事件告知客户端，便于与连接中断区分
+        try:
+            yield from stages()
+        except Exception as e:
+            logger.error(f"流式文案处理异常: {url} - {e}")
+            yield _sse("error", {"success": False, "error": str(e)})
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # 关闭 nginx 缓冲，事件即时送达
     })
 
 
-@app.route("/api/save_feishu", methods=["POST"])
-def api_save_feishu():
-    """接口3: 解析视频 + 转写 + AI润色 + 保存到飞书
+def _get_batch_urls():
+    """读取批量接口的 urls 参数，返回 (urls, 错误响应)"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    urls = data.get("urls")
+    if not isinstance(urls, list) or not urls:
+        return None, (jsonify({"success": False, "error": "请提供 urls 参数（链接数组）"}), 400)
+    if len(urls) > BATCH_MAX_SIZE:
+        return None, (jsonify({"success": False, "error": f"单次最多 {BATCH_MAX_SIZE} 个链接"}), 400)
+    return urls, None
 
-    请求: {"url": "抖音链接或分享文本"}
-    响应: {"success": true, "doc_url": "飞书文档链接", "doc_title": "文档标题"}
+
+@app.route("/api/resolve_batch", methods=["POST"])
+def api_resolve_batch():
+    """批量解析视频下载地址
+
+    请求: {"urls": ["抖音链接或分享文本", ...]}（最多 50 个）
+    响应: {"success": true, "results": [每个链接的 /api/resolve 结果，顺序与请求一致]}
     """
-    data = request.get_json(silent=True) or {}
-    url = data.get("url", "").strip()
-    if not url:
-        return jsonify({"success": False, "error": "请提供 url 参数"}), 400
+    urls, error = _get_batch_urls()
+    if error:
+        return error
+    results = _run_batch(_resolve_batch_executor, _resolve_video, urls)
+    return jsonify({"success": True, "results": results})
 
-    client = get_feishu()
-    if not client:
-        return jsonify({"success": False, "error": "飞书功能未配置"})
 
+@app.route("/api/transcript_batch", methods=["POST"])
+def api_transcript_batch():
+    """批量获取文案（解析 + 转写 + AI润色），最多同时转写 5 个
+
+    请求: {"urls": ["抖音链接或分享文本", ...]}（最多 50 个）
+    响应: {"success": true, "results": [每个链接的 /api/transcript 结果，顺序与请求一致]}
+    """
+    urls, error = _get_batch_urls()
+    if error:
+        return error
+    results = _run_batch(_transcript_batch_executor, _transcript_pipeline, urls)
+    return jsonify({"success": True, "results": results})
+
+
+def _save_feishu_pipeline(client, url: str) -> dict:
+    """解析 + 转写 + AI 处理 + 保存到飞书，返回结果字典"""
     # 1. 解析视频
     resolve_result = _resolve_video(url)
     if not resolve_result.get("success"):
-        return jsonify(resolve_result)
+        return resolve_result
 
     # 2. 语音转文字
     transcript = _transcribe_video(resolve_result["play_url"])
     if not transcript.get("success"):
-        return jsonify({"success": False, "error": f"转写失败: {transcript.get('error')}"})
+        return {"success": False, "error": f"转写失败: {transcript.get('error')}"}
 
     # 3. AI 处理
     ai_result = _ai_process(transcript["text"], resolve_result.get("title", ""))
@@ -218,25 +553,83 @@ def api_save_feishu():
         summary=ai_result["summary"],
     )
     if result.success:
-        return jsonify({"success": True, "doc_url": result.doc_url, "doc_title": result.doc_title})
+        return {"success": True, "doc_url": result.doc_url, "doc_title": result.doc_title}
     else:
-        return jsonify({"success": False, "error": result.error})
+        return {"success": False, "error": result.error}
+
+
+def _run_save_feishu_job(job_id: str, client, url: str):
+    """后台执行保存飞书任务，更新任务状态"""
+    _jobs.update(job_id, "running")
+    try:
+        result = _save_feishu_pipeline(client, url)
+    except Exception as e:
+        logger.error(f"保存飞书任务异常: {job_id} - {e}")
+        _jobs.update(job_id, "failed", error=str(e))
+        return
+    if result.get("success"):
+        _jobs.update(job_id, "done", result=result)
+    else:
+        _jobs.update(job_id, "failed", error=result.get("error", "未知错误"))
+
+
+@app.route("/api/save_feishu", methods=["POST"])
+@require_douyin_url
+def api_save_feishu():
+    """接口3: 解析视频 + 转写 + AI润色 + 保存到飞书（异步任务）
+
+    请求: {"url": "抖音链接或分享文本"}
+    响应: 202 {"success": true, "job_id": "...", "status": "pending"}
+    之后轮询 GET /api/jobs/<job_id>，完成后 result 为 {"success": true, "doc_url": "飞书文档链接", "doc_title": "文档标题"}
+    """
+    url = g.url
+    client = get_feishu()
+    if not client:
+        return jsonify({"success": False, "error": "飞书功能未配置"})
+
+    job_id = _jobs.create()
+    _job_executor.submit(_run_save_feishu_job, job_id, client, url)
+    logger.info(f"保存飞书任务已提交: {job_id} - {url}")
+    return jsonify({"success": True, "job_id": job_id, "status": "pending"}), 202
+
+
+@app.route("/api/jobs/<job_id>")
+def api_job(job_id: str):
+    """查询异步任务状态
+
+    响应: {
+        "success": true,
+        "job_id": "...",
+        "status": "pending | running | done | failed",
+        "result": {...},   # status 为 done 时返回
+        "error": "..."     # status 为 failed 时返回
+    }
+    """
+    job = _jobs.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "任务不存在或已过期"}), 404
+    resp = {"success": True, "job_id": job_id, "status": job["status"]}
+    if "result" in job:
+        resp["result"] = job["result"]
+    if "error" in job:
+        resp["error"] = job["error"]
+    return jsonify(resp)
 
 
 @app.route("/api/email", methods=["POST"])
+@require_douyin_url
 def api_email():
     """接口4: 解析视频 + 转写 + AI润色 + 发送邮件
 
     请求: {"url": "抖音链接或分享文本", "to": "收件人邮箱(可选，默认用配置)"}
     响应: {"success": true}
     """
-    data = request.get_json(silent=True) or {}
-    url = data.get("url", "").strip()
-    to_addr = data.get("to", "").strip() or Config.EMAIL_TO
-    if not url:
-        return jsonify({"success": False, "error": "请提供 url 参数"}), 400
+    url = g.url
+    to_addr = str(g.data.get("to") or "").strip() or Config.EMAIL_TO
     if not to_addr:
         return jsonify({"success": False, "error": "请提供收件人邮箱"}), 400
+    if not _is_valid_email(to_addr):
+        return jsonify({"success": False, "error": "收件人邮箱格式不正确"}), 400
 
     sender = get_email()
     if not sender:
@@ -271,24 +664,47 @@ def api_email():
         return jsonify({"success": False, "error": result.error})
 
 
-@app.route("/api/download")
-def api_download():
-    """接口5: 代理下载视频（绕过抖音 Referer 防盗链）
-    
-    请求: GET /api/download?url=播放地址&title=视频标题(可选)
-    响应: 视频文件流
+def _safe_filename(title: str) -> str:
+    """清理文件名，只保留中文、英文、数字、下划线和连字符，最长 60 字符"""
+    if title.isascii():
+        return title.translate(_SAFE_TRANS)[:60]
+    return _FILENAME_RE.sub('_', title)[:60]
+
+
+def _is_http_url(video_url: str) -> bool:
+    """只允许带主机名的 http/https 地址（不含用户信息）"""
+    parts = urlsplit(video_url)
+    return parts.scheme in ("http", "https") and bool(parts.hostname) and "@" not in parts.netloc
+
+
+def _xaccel_location(video_url: str) -> str:
+    """将播放地址转换为 nginx 内部 location：/internal_cdn/<scheme>/<host>/<path>?<query>"""
+    parts = urlsplit(video_url)
+    location = f"/internal_cdn/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+    if parts.query:
+        location += f"?{parts.query}"
+    return location
+
+
+def _proxy_video(video_url: str, title: str = "video"):
+    """以抖音 Referer 请求播放地址，并将视频流式转发给调用方
+
+    开启 Config.USE_XACCEL 时只返回 X-Accel-Redirect 响应头，由 nginx 拉取并转发视频，
+    worker 线程立即释放；否则由 Python 流式转发。
     """
-    video_url = request.args.get("url", "").strip()
-    title = request.args.get("title", "video").strip() or "video"
-    if not video_url:
-        return jsonify({"success": False, "error": "缺少 url 参数"}), 400
+    if not _is_http_url(video_url):
+        return jsonify({"success": False, "error": "仅支持 http/https 播放地址"}), 400
 
-    import re
-    from urllib.parse import quote
-    # 清理文件名，只保留中文、英文、数字、下划线和连字符
-    safe_title = re.sub(r'[^\w\u4e00-\u9fff\-]', '_', title)[:60]
     # URL 编码文件名，支持中文
-    encoded_title = quote(safe_title)
+    encoded_title = quote(_safe_filename(title))
+    content_disposition = f'attachment; filename="{encoded_title}.mp4"; filename*=UTF-8\'\'{encoded_title}.mp4'
+
+    if Config.USE_XACCEL:
+        return Response(headers={
+            "X-Accel-Redirect": _xaccel_location(video_url),
+            "Content-Type": "video/mp4",
+            "Content-Disposition": content_disposition,
+        })
 
     try:
         # 使用移动端 UA 和 Referer，模拟手机浏览器访问
@@ -299,10 +715,12 @@ def api_download():
                 "Chrome/116.0.0.0 Mobile Safari/537.36"
             ),
             "referer": "https://www.douyin.com/",
+            # 响应字节原样透传，不能让 CDN 返回调用方未协商的压缩编码
+            "accept-encoding": "identity",
         }
         
         # 请求视频，allow_redirects=True 会自动跟踪 302 重定向到 CDN
-        upstream = http_requests.get(
+        upstream = cdn_session.get(
             video_url, 
             headers=headers, 
             stream=True, 
@@ -312,26 +730,66 @@ def api_download():
         
         if upstream.status_code != 200:
             logger.error(f"上游返回 {upstream.status_code}: {video_url}")
+            upstream.close()
             return jsonify({"success": False, "error": f"上游返回 {upstream.status_code}"}), 502
 
         content_type = upstream.headers.get("Content-Type", "video/mp4")
         content_length = upstream.headers.get("Content-Length", "")
+        content_encoding = upstream.headers.get("Content-Encoding", "")
 
         resp_headers = {
             "Content-Type": content_type,
-            "Content-Disposition": f'attachment; filename="{encoded_title}.mp4"; filename*=UTF-8\'\'{encoded_title}.mp4',
+            "Content-Disposition": content_disposition,
         }
         if content_length:
             resp_headers["Content-Length"] = content_length
-
-        # 流式返回视频内容
-        return Response(upstream.iter_content(chunk_size=65536), headers=resp_headers)
+        if content_encoding:
+            # 原样转发未解压的字节，编码头也要一并透传
+            resp_headers["Content-Encoding"] = content_encoding
+
+        # 直接读取上游原始字节，跳过 iter_content 的解码层
+        # （不使用 wsgi.file_wrapper：其 fileno() 是上游 socket，sendfile 会发出 TLS 密文）
+        body = upstream.raw.stream(65536, decode_content=False)
+
+        # 响应结束（含客户端中途断开）时立即释放上游连接
+        resp = Response(body, headers=resp_headers, direct_passthrough=True)
+        resp.call_on_close(upstream.close)
+        return resp
         
     except http_requests.RequestException as e:
         logger.error(f"下载失败: {video_url} - {e}")
         return jsonify({"success": False, "error": str(e)}), 502
 
 
+@app.route("/api/download")
+def api_download():
+    """接口5: 代理下载视频（绕过抖音 Referer 防盗链）
+    
+    请求: GET /api/download?url=播放地址&title=视频标题(可选)
+    响应: 视频文件流
+    """
+    video_url = request.args.get("url", "").strip()
+    title = request.args.get("title", "video").strip() or "video"
+    if not video_url:
+        return jsonify({"success": False, "error": "缺少 url 参数"}), 400
+    return _proxy_video(video_url, title)
+
+
+@app.route("/api/proxy/<token>")
+def api_proxy(token: str):
+    """转写专用代理：火山引擎通过签名地址拉取视频
+
+    token 由 _signed_proxy_url 签发，包含播放地址，超过 PROXY_TOKEN_TTL 秒后失效。
+    """
+    if _proxy_signer is None:
+        return jsonify({"success": False, "error": "转写代理未配置"}), 503
+    try:
+        video_url = _proxy_signer.loads(token, max_age=Config.PROXY_TOKEN_TTL)
+    except BadSignature:
+        return jsonify({"success": False, "error": "代理地址无效或已过期"}), 403
+    return _proxy_video(video_url)
+
+
 @app.route("/health")
 def health():
     """健康检查"""
@@ -341,6 +799,7 @@ def health():
         "ai": Config.is_ai_enabled(),
         "feishu": Config.is_feishu_enabled(),
         "email": Config.is_email_enabled(),
+        "cache_hit_rate": hit_rate(_resolve_cache, _transcript_cache, _ai_cache),
     })
 
 
@@ -351,9 +810,18 @@ if __name__ == "__main__":
     print(f"   接口:")
     print(f"   POST /api/resolve      - 解析下载地址")
     print(f"   POST /api/transcript   - 获取文案(转写+AI)")
-    print(f"   POST /api/save_feishu  - 保存到飞书")
+    print(f"   POST /api/transcript/stream - 获取文案(SSE 流式)")
+    print(f"   POST /api/resolve_batch    - 批量解析")
+    print(f"   POST /api/transcript_batch - 批量获取文案")
+    print(f"   POST /api/save_feishu  - 保存到飞书(异步)")
+    print(f"   GET  /api/jobs/<job_id> - 查询任务状态")
     print(f"   POST /api/email        - 发送邮件")
     print(f"   GET  /api/download     - 代理下载视频")
+    print(f"   GET  /api/proxy/<token> - 转写签名代理")
     print(f"   GET  /health           - 健康检查")
     print()
-    app.run(host="0.0.0.0", port=port, debug=False)
+    print(f"   开发模式（多线程）。生产环境请使用 gthread worker：")
+    print(f"   gunicorn -k gthread -w 1 --threads 64 -b 0.0.0.0:{port} --timeout 180 --backlog 2048 --keep-alive 30 app:app")
+    print(f"   （未配置 REDIS_URL 时必须单进程 -w 1，否则 /api/jobs 轮询可能查不到任务）")
+    print()
+    app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
@@ -0,0 +1,123 @@
+"""进程内结果缓存
+
+为 解析 / 转写 / AI 处理 三个阶段提供带过期时间的 LRU 缓存。
+同一个抖音视频的解析结果、转写文字和 AI 润色结果都是确定的，
+命中缓存时可以跳过耗时数秒到数分钟的网络调用。
+
+同一个键的并发请求只执行一次（single-flight）：后到的请求等待进行中的结果，
+避免批量触发时对同一视频重复转写、重复调用大模型。
+"""
+
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def hash_key(*parts: str) -> str:
+    """将若干字符串拼接后取 sha1，作为缓存键"""
+    return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+class StageCache:
+    """单个处理阶段的 LRU + TTL 缓存（线程安全）
+
+    只缓存成功的结果；失败结果不写入，下次请求会重新执行。
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 86400):
+        """
+        Args:
+            name: 阶段名称，用于日志
+            maxsize: 最大缓存条数
+            ttl: 过期时间（秒），默认 1 天
+        """
+        self.name = name
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._inflight: Dict[str, Future] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        """查询缓存，未命中返回 None"""
+        with self._lock:
+            value = self._cache.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if value is not None:
+            logger.info(f"缓存命中[{self.name}]: {key}")
+        return value
+
+    def set(self, key: str, value: Any):
+        """写入缓存"""
+        with self._lock:
+            self._cache[key] = value
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """查询缓存，未命中时执行 compute；同一键的并发调用共享同一次执行结果
+
+        Args:
+            key: 缓存键
+            compute: 未命中时调用的计算函数
+            cacheable: 判断结果是否写入缓存，默认全部写入；不写入的结果仍会分享给并发等待者
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            # 加锁后再查一次：可能刚有并发请求完成并写入了缓存
+            value = self._cache.get(key)
+            if value is not None:
+                return value
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            logger.info(f"合并并发请求[{self.name}]: {key}")
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+
+def hit_rate(*caches: StageCache) -> float:
+    """计算若干缓存的总体命中率"""
+    hits = sum(c.hits for c in caches)
+    total = hits + sum(c.misses for c in caches)
+    return round(hits / total, 4) if total else 0.0
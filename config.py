@@ -13,6 +13,17 @@ class Config:
     VOLC_APP_ID: str = os.environ.get("VOLC_APP_ID", "")
     VOLC_ACCESS_TOKEN: str = os.environ.get("VOLC_ACCESS_TOKEN", "")
 
+    # 转写代理：火山引擎通过本服务下载视频时使用的地址和签名密钥
+    # PROXY_SECRET 为代理地址的专用签名密钥，必须单独配置（多 worker 间需保持一致）
+    PUBLIC_BASE_URL: str = os.environ.get("PUBLIC_BASE_URL", "http://127.0.0.1:3102").rstrip("/")
+    PROXY_SECRET: str = os.environ.get("PROXY_SECRET", "")
+    PROXY_TOKEN_TTL: int = int(os.environ.get("PROXY_TOKEN_TTL", "3600"))
+    # 前置 nginx 时开启：代理下载交给 nginx 通过 X-Accel-Redirect 完成，Python 只返回响应头
+    USE_XACCEL: bool = os.environ.get("USE_XACCEL", "").strip().lower() in ("1", "true", "yes")
+
+    # 异步任务状态存储：多个 worker 需共享任务状态时配置 Redis，为空则保存在进程内存
+    REDIS_URL: str = os.environ.get("REDIS_URL", "")
+
     # 飞书开放平台
     FEISHU_APP_ID: str = os.environ.get("FEISHU_APP_ID", "")
     FEISHU_APP_SECRET: str = os.environ.get("FEISHU_APP_SECRET", "")
@@ -21,6 +32,8 @@ class Config:
     # 火山方舟（豆包大模型）
     ARK_API_KEY: str = os.environ.get("ARK_API_KEY", "")
     ARK_MODEL: str = os.environ.get("ARK_MODEL", "doubao-seed-2-0-mini-260215")
+    # 为 true 时总是调用大模型重新生成标题；默认只在原标题缺失或过短时生成
+    AI_FORCE_TITLE: bool = os.environ.get("AI_FORCE_TITLE", "").strip().lower() in ("1", "true", "yes")
 
     # 邮件发送 (SMTP)
     SMTP_HOST: str = os.environ.get("ALERT_SMTP_HOST", "").strip('"')
@@ -31,8 +44,8 @@ class Config:
 
     @classmethod
     def is_transcribe_enabled(cls) -> bool:
-        """转写功能是否已配置"""
-        return bool(cls.VOLC_APP_ID and cls.VOLC_ACCESS_TOKEN)
+        """转写功能是否已配置（火山引擎通过签名代理拉取视频，需要 PROXY_SECRET）"""
+        return bool(cls.VOLC_APP_ID and cls.VOLC_ACCESS_TOKEN and cls.PROXY_SECRET)
 
     @classmethod
     def is_feishu_enabled(cls) -> bool:
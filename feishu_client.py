@@ -10,6 +10,7 @@
 """
 
 import logging
+import threading
 import time
 from dataclasses import dataclass
 from typing import Optional
@@ -39,24 +40,29 @@ class FeishuClient:
         self.folder_token = folder_token
         self._token: Optional[str] = None
         self._token_expires: float = 0
+        self._token_lock = threading.Lock()
 
     def _get_token(self) -> str:
-        """获取 tenant_access_token（带缓存）"""
+        """获取 tenant_access_token（带缓存，并发请求只刷新一次）"""
         if self._token and time.time() < self._token_expires:
             return self._token
 
-        resp = requests.post(f"{_BASE}/auth/v3/tenant_access_token/internal", json={
-            "app_id": self.app_id,
-            "app_secret": self.app_secret,
-        }, timeout=10)
+        with self._token_lock:
+            if self._token and time.time() < self._token_expires:
+                return self._token
 
-        data = resp.json()
-        if data.get("code") != 0:
-            raise RuntimeError(f"获取飞书 token 失败: {data.get('msg')}")
+            resp = requests.post(f"{_BASE}/auth/v3/tenant_access_token/internal", json={
+                "app_id": self.app_id,
+                "app_secret": self.app_secret,
+            }, timeout=10)
 
-        self._token = data["tenant_access_token"]
-        self._token_expires = time.time() + data.get("expire", 7200) - 300
-        return self._token
+            data = resp.json()
+            if data.get("code") != 0:
+                raise RuntimeError(f"获取飞书 token 失败: {data.get('msg')}")
+
+            self._token = data["tenant_access_token"]
+            self._token_expires = time.time() + data.get("expire", 7200) - 300
+            return self._token
 
     def _headers(self) -> dict:
         return {
@@ -0,0 +1,74 @@
+"""异步任务状态存储
+
+耗时接口（如保存到飞书）提交后立即返回 job_id，调用方再通过 GET /api/jobs/<job_id> 轮询结果。
+任务状态流转：pending -> running -> done / failed
+
+默认保存在进程内存中；多个 gunicorn worker 之间需要共享任务状态时，
+配置 REDIS_URL 后改用 Redis 存储（需要安装 redis 包）。
+"""
+
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "douyin-api:job:"
+
+
+class JobStore:
+    """任务状态表（线程安全）"""
+
+    def __init__(self, redis_url: str = "", ttl: int = 86400):
+        """
+        Args:
+            redis_url: Redis 连接地址，为空时使用进程内存
+            ttl: 任务状态保留时间（秒），默认 1 天
+        """
+        self.ttl = ttl
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url)
+
+    def create(self) -> str:
+        """创建一个 pending 状态的任务，返回 job_id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._save(job_id, {"status": "pending", "created_at": now, "updated_at": now})
+        return job_id
+
+    def update(self, job_id: str, status: str, **fields):
+        """更新任务状态，附带结果或错误信息"""
+        job = self.get(job_id) or {"created_at": time.time()}
+        job.update(fields, status=status, updated_at=time.time())
+        self._save(job_id, job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """查询任务，不存在或已过期返回 None"""
+        if self._redis is not None:
+            raw = self._redis.get(_REDIS_PREFIX + job_id)
+            return json.loads(raw) if raw else None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _save(self, job_id: str, job: dict):
+        if self._redis is not None:
+            self._redis.set(_REDIS_PREFIX + job_id, json.dumps(job, ensure_ascii=False), ex=self.ttl)
+            return
+        with self._lock:
+            self._jobs[job_id] = job
+            self._prune()
+
+    def _prune(self):
+        """清理超过保留时间的任务（调用方需持有锁）"""
+        expire_before = time.time() - self.ttl
+        expired = [k for k, v in self._jobs.items() if v["updated_at"] < expire_before]
+        for k in expired:
+            del self._jobs[k]
@@ -159,6 +159,44 @@ class TranscriptResult:
         )
 
 
+@dataclass(slots=True)
+class TranscriptResponse:
+    """/api/transcript 成功响应
+
+    字段顺序即响应 JSON 的字段顺序；orjson 可直接序列化 dataclass，无需先转成 dict。
+    """
+    success: bool = True
+    title: str = ""
+    author: str = ""
+    duration: float = 0.0
+    text: str = ""
+    summary: str = ""
+    play_url: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "success": self.success,
+            "title": self.title,
+            "author": self.author,
+            "duration": self.duration,
+            "text": self.text,
+            "summary": self.summary,
+            "play_url": self.play_url,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TranscriptResponse":
+        return cls(
+            success=data.get("success", True),
+            title=data.get("title", ""),
+            author=data.get("author", ""),
+            duration=data.get("duration", 0.0),
+            text=data.get("text", ""),
+            summary=data.get("summary", ""),
+            play_url=data.get("play_url", ""),
+        )
+
+
 @dataclass
 class SummaryResult:
     """AI 摘要结果"""
@@ -26,6 +26,9 @@ _HEADERS = {
     "referer": "https://www.douyin.com/?is_from_mobile_home=1&recommend=1",
 }
 
+# 抖音链接：douyin.com / iesdouyin.com 及其任意子域名（v. / www. / m. 等）
+_DOUYIN_URL_RE = re.compile(r'https?://(?:[\w-]+\.)*(?:douyin|iesdouyin)\.com/\S+')
+
 _SHARE_URL_TEMPLATE = "https://www.iesdouyin.com/share/video/{aweme_id}/"
 _PLAY_URL_TEMPLATE = "https://www.douyin.com/aweme/v1/play/?video_id={video_id}"
 
@@ -39,6 +42,7 @@ def extract_url_from_text(text: str) -> Optional[str]:
     - https://v.douyin.com/xxx （短链接）
     - https://www.douyin.com/video/xxx （长链接）
     - http(s)://www.iesdouyin.com/share/video/xxx
+    - 以及 douyin.com / iesdouyin.com 的其他子域名，如 https://m.douyin.com/share/video/xxx
 
     示例输入：
         '3.05 复制打开抖音，看看【量子位的作品】... https://v.douyin.com/pblL5pmtw_4/ NwF:/'
@@ -46,10 +50,7 @@ def extract_url_from_text(text: str) -> Optional[str]:
         'https://v.douyin.com/pblL5pmtw_4/'
     """
     # 优先匹配抖音域名的 URL
-    match = re.search(
-        r'https?://(?:v\.douyin\.com|www\.douyin\.com|www\.iesdouyin\.com)/\S+',
-        text,
-    )
+    match = _DOUYIN_URL_RE.search(text)
     if match:
         # 去除尾部可能粘连的非 URL 字符
         url = match.group(0).rstrip('。，！？、）》」】')